@@ -0,0 +1,134 @@
+"""Declarative data-quality rules for the PizzaChain Glue job.
+
+Every table has an ordered list of ``(reason_code, predicate)`` rules. The
+predicate is a Spark SQL expression that is true for a valid row; a NULL result
+counts as a failure, matching how the old ``filter("col != ''")`` strings
+dropped NULLs. All rules of a table are evaluated in a single projection that
+tags each row with the reason codes it failed, so one scan feeds the clean
+output, the quarantine output and the per-rule metrics.
+
+Only pyspark is imported here, so the module runs under a local PySpark
+session as well as inside Glue (ship it with ``--extra-py-files``).
+"""
+from pyspark import StorageLevel
+from pyspark.sql.functions import (
+    array, array_contains, broadcast, coalesce, col, expr, lit, size, when,
+)
+from pyspark.sql.functions import filter as array_filter
+from pyspark.sql.functions import sum as sum_
+
+FAILED_RULES_COL = "dq_failed_rules"
+
+# Foreign keys checked against an already validated dimension table. Each
+# entry adds a boolean ``_ref_<dimension>`` column that the rules below use.
+TABLE_REFERENCES = {
+    "order_items": [
+        ("sku_id", "sku_master"),
+        ("discount_code", "discounts_applied"),
+    ],
+    "inventory_logs": [
+        ("sku_id", "sku_master"),
+    ],
+}
+
+TABLE_RULES = {
+    "sku_master": [
+        ("missing_sku_id", "sku_id != ''"),
+    ],
+    "discounts_applied": [
+        ("missing_discount_code", "discount_code != ''"),
+    ],
+    "order_items": [
+        ("missing_order_id", "order_id != ''"),
+        ("missing_sku_id", "sku_id != ''"),
+        ("invalid_quantity", "quantity IS NOT NULL AND quantity != 0"),
+        ("invalid_unit_price", "unit_price IS NOT NULL AND unit_price != 0"),
+        ("unknown_sku_id", "sku_id IS NULL OR sku_id = '' OR _ref_sku_master"),
+        # A line item without a discount code is valid; only unknown codes are rejected.
+        ("unknown_discount_code",
+         "discount_code IS NULL OR discount_code = '' OR _ref_discounts_applied"),
+    ],
+    "orders": [
+        ("missing_order_id", "order_id != ''"),
+    ],
+    "inventory_logs": [
+        ("missing_sku_id", "sku_id != ''"),
+        ("missing_store_id", "store_id IS NOT NULL"),
+        ("invalid_current_stock", "current_stock IS NOT NULL AND current_stock != 0"),
+        ("unknown_sku_id", "sku_id IS NULL OR sku_id = '' OR _ref_sku_master"),
+    ],
+}
+
+
+def attach_references(df, table, dimensions):
+    """Left-join the reference flags declared for ``table`` onto ``df``."""
+    for key, dimension in TABLE_REFERENCES.get(table, []):
+        flag = "_ref_" + dimension
+        keys = dimensions[dimension].select(key).distinct().withColumn(flag, lit(True))
+        df = df.join(broadcast(keys), on=key, how="left")
+    return df
+
+
+def tag_failures(df, rules):
+    """Add ``dq_failed_rules``: the reason codes of every rule the row fails."""
+    failures = [
+        when(~coalesce(expr(predicate), lit(False)), lit(code))
+        for code, predicate in rules
+    ]
+    return df.withColumn(
+        FAILED_RULES_COL, array_filter(array(*failures), lambda code: code.isNotNull())
+    )
+
+
+def rule_counts(tagged_df, rules):
+    """Count total, rejected and per-rule failed rows in one aggregation."""
+    failed = col(FAILED_RULES_COL)
+    aggregates = [
+        sum_(lit(1)).alias("rows_total"),
+        sum_(when(size(failed) > 0, 1).otherwise(0)).alias("rows_rejected"),
+    ]
+    aggregates += [
+        sum_(when(array_contains(failed, code), 1).otherwise(0)).alias(code)
+        for code, _ in rules
+    ]
+    row = tagged_df.agg(*aggregates).first()
+    return {name: int(value or 0) for name, value in row.asDict().items()}
+
+
+def validate(df, table, dimensions=None):
+    """Split ``df`` into clean rows, quarantined rows and rule metrics.
+
+    Returns ``(valid_df, quarantine_df, metrics, tagged_df)``. ``quarantine_df``
+    keeps the source columns plus ``dq_failed_rules``; ``metrics`` maps
+    ``rows_total``, ``rows_rejected`` and each reason code to a row count.
+    ``tagged_df`` is the persisted frame both outputs read from; call
+    ``tagged_df.unpersist()`` once they have been written.
+    """
+    rules = TABLE_RULES[table]
+    tagged = attach_references(df, table, dimensions or {})
+    tagged = tag_failures(tagged, rules)
+    tagged = tagged.drop(*["_ref_" + dim for _, dim in TABLE_REFERENCES.get(table, [])])
+    # The metrics action and both writes read this frame; don't re-read the source.
+    tagged = tagged.persist(StorageLevel.MEMORY_AND_DISK)
+
+    metrics = rule_counts(tagged, rules)
+    valid_df = tagged.filter(size(col(FAILED_RULES_COL)) == 0).drop(FAILED_RULES_COL)
+    quarantine_df = tagged.filter(size(col(FAILED_RULES_COL)) > 0)
+    return valid_df, quarantine_df, metrics, tagged
+
+
+def enrich_order_items(order_items_df, sku_df, discounts_df):
+    """Add item totals, SKU details and discounts to validated order items.
+
+    Unknown SKUs and discount codes are already quarantined by the
+    ``order_items`` rules, so the joins drop nothing. Items without a discount
+    code are kept with a ``line_discount_amount`` of 0.0.
+    """
+    return order_items_df \
+        .withColumn("quantity", col("quantity").cast("int")) \
+        .withColumn("unit_price", col("unit_price").cast("double")) \
+        .withColumn("item_total", col("quantity") * col("unit_price")) \
+        .join(sku_df, on="sku_id", how="inner") \
+        .join(discounts_df.select("discount_code", "line_discount_amount"),
+              on="discount_code", how="left") \
+        .withColumn("line_discount_amount", coalesce(col("line_discount_amount"), lit(0.0)))
@@ -1,11 +1,14 @@
 import sys
 import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from pyspark.context import SparkContext
 from awsglue.context import GlueContext
 from awsglue.utils import getResolvedOptions
 from awsglue.job import Job
 from pyspark.sql.functions import *
 from awsglue.dynamicframe import DynamicFrame
+from data_quality import enrich_order_items, validate
 
 # Job setup
 args = getResolvedOptions(sys.argv, ["JOB_NAME"])
@@ -22,13 +25,61 @@ spark._jsc.hadoopConfiguration().set("hadoop.tmp.dir", "s3://tbsm-core/glue-temp
 # Config
 database_name = "pizzachain-rds-tbsm-db"
 s3_output_base = "s3://pizzachain-curated-data-tbsm/"
+s3_quarantine_base = s3_output_base + "quarantine/"
+metrics_namespace = "PizzaChain/DataQuality"
+
+# Fail fast when CloudWatch is unreachable (e.g. a VPC without NAT or endpoint);
+# the defaults would stall for minutes on each of the five tables.
+cloudwatch = boto3.client("cloudwatch", config=Config(
+    connect_timeout=5, read_timeout=10, retries={"max_attempts": 1},
+))
+quarantine_dfs = {}
+dq_tagged_dfs = {}
+
+
+def publish_dq_metrics(table, metrics):
+    """Log per-rule row counts and push them to CloudWatch as job metrics."""
+    print(f"Data quality [{table}]: {metrics}")
+    dimensions = [
+        {"Name": "JobName", "Value": args["JOB_NAME"]},
+        {"Name": "Table", "Value": table},
+    ]
+    metric_data = [
+        {"MetricName": "RowsTotal", "Dimensions": dimensions,
+         "Value": metrics.pop("rows_total"), "Unit": "Count"},
+        {"MetricName": "RowsRejected", "Dimensions": dimensions,
+         "Value": metrics.pop("rows_rejected"), "Unit": "Count"},
+    ]
+    for rule, count in metrics.items():
+        metric_data.append({
+            "MetricName": "RuleFailures",
+            "Dimensions": dimensions + [{"Name": "Rule", "Value": rule}],
+            "Value": count,
+            "Unit": "Count",
+        })
+    # Metrics are best effort; a missing permission, credential or network route
+    # must not abort the data load.
+    try:
+        cloudwatch.put_metric_data(Namespace=metrics_namespace, MetricData=metric_data)
+    except (ClientError, BotoCoreError) as e:
+        print(f"Could not publish data quality metrics for {table}: {e}")
+
+
+def run_dq(df, table, dimensions=None):
+    """Validate a table, keep its rejects for quarantine and return clean rows."""
+    valid_df, quarantine_df, metrics, tagged_df = validate(df, table, dimensions)
+    quarantine_dfs[table] = quarantine_df
+    dq_tagged_dfs[table] = tagged_df
+    publish_dq_metrics(table, metrics)
+    return valid_df
+
 
 # -------- Step 1: sku_master --------
 sku_df = glueContext.create_dynamic_frame.from_catalog(
     database=database_name, table_name="pizzachain_sku_master"
 ).toDF()
 
-sku_df = sku_df.filter("sku_id != ''") \
+sku_df = run_dq(sku_df, "sku_master") \
     .withColumn("item_name", trim(lower(col("item_name")))) \
     .withColumn("category", trim(lower(col("category")))) \
     .withColumn("price", col("price").cast("double"))
@@ -38,7 +89,7 @@ discounts_df = glueContext.create_dynamic_frame.from_catalog(
     database=database_name, table_name="pizzachain_discounts_applied"
 ).toDF()
 
-discounts_df = discounts_df.filter("discount_code != ''") \
+discounts_df = run_dq(discounts_df, "discounts_applied") \
     .withColumn("discount_code", trim(col("discount_code"))) \
     .withColumn("line_discount_amount", col("discount_amount").cast("double")) \
     .drop("discount_amount")
@@ -48,21 +99,18 @@ order_items_df = glueContext.create_dynamic_frame.from_catalog(
     database=database_name, table_name="pizzachain_order_items"
 ).toDF()
 
-order_items_df = order_items_df.filter(
-    "order_id != '' AND sku_id != '' AND discount_code != '' AND quantity IS NOT NULL AND unit_price IS NOT NULL AND quantity != 0 AND unit_price != 0"
-) \
-    .withColumn("quantity", col("quantity").cast("int")) \
-    .withColumn("unit_price", col("unit_price").cast("double")) \
-    .withColumn("item_total", col("quantity") * col("unit_price")) \
-    .join(sku_df, on="sku_id", how="inner") \
-    .join(discounts_df.select("discount_code", "line_discount_amount"), on="discount_code", how="inner")
+order_items_df = run_dq(order_items_df, "order_items", {
+    "sku_master": sku_df,
+    "discounts_applied": discounts_df,
+})
+order_items_df = enrich_order_items(order_items_df, sku_df, discounts_df)
 
 # -------- Step 4: orders --------
 orders_df = glueContext.create_dynamic_frame.from_catalog(
     database=database_name, table_name="pizzachain_orders"
 ).toDF()
 
-orders_df = orders_df.filter("order_id != ''")
+orders_df = run_dq(orders_df, "orders")
 
 order_totals = order_items_df.groupBy("order_id").agg(
     sum("item_total").alias("order_total"),
@@ -77,9 +125,7 @@ inventory_df = glueContext.create_dynamic_frame.from_catalog(
     database=database_name, table_name="pizzachain_inventory_logs"
 ).toDF()
 
-inventory_df = inventory_df.filter(
-    "sku_id != '' AND store_id IS NOT NULL AND current_stock IS NOT NULL AND current_stock != 0"
-) \
+inventory_df = run_dq(inventory_df, "inventory_logs", {"sku_master": sku_df}) \
     .withColumnRenamed("current_stock", "stock_qty") \
     .withColumn("stock_qty", col("stock_qty").cast("int")) \
     .join(sku_df.select("sku_id", "price"), on="sku_id", how="inner") \
@@ -97,6 +143,10 @@ order_items_df.write.mode("overwrite").parquet(s3_output_base + "pizzadb_orders_
 orders_df.write.mode("overwrite").parquet(s3_output_base + "pizzadb_orders/")
 inventory_df.write.mode("overwrite").parquet(s3_output_base + "pizzadb_inventory_stock/")
 store_df.write.mode("overwrite").parquet(s3_output_base + "pizzadb_stores/")
+for table, quarantine_df in quarantine_dfs.items():
+    quarantine_df.write.mode("overwrite").parquet(s3_quarantine_base + table + "/")
+    # Quarantine is the last write that reads each validated table.
+    dq_tagged_dfs[table].unpersist()
 
 # Commit the job
 job.commit()
@@ -0,0 +1,141 @@
+"""Benchmark the Glue data-quality stage against the old string filters.
+
+Runs under a local PySpark session (``pip install pyspark``, Java required):
+
+    python scripts/benchmark_data_quality.py
+
+Three variants of the order_items step are timed:
+
+- legacy: the old string filter and inner joins
+- tag only: the reference joins and the single rule-tagging projection
+- rules: what gluejob.py now runs. That is ``validate()`` (tagging plus the
+  per-rule count action), ``enrich_order_items()`` and the quarantine output.
+  The counts are computed but not published to CloudWatch.
+
+Outputs go to Spark's ``noop`` sink, so the timings cover the scan and the
+per-row work but not S3 writes. One untimed round warms up the JVM, then the
+variants run interleaved for each repeat. Medians are reported because
+single-core runs stay noisy for a repeat or two after the warm-up. The rules
+variant releases its persisted frame each time, so no repeat reads an earlier
+repeat's cache.
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from pyspark.sql import SparkSession
+from pyspark.sql.functions import col
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "glue"))
+from data_quality import (  # noqa: E402
+    TABLE_REFERENCES, TABLE_RULES, attach_references, enrich_order_items, tag_failures, validate,
+)
+
+# Config
+NUM_ORDER_ITEMS = 2_000_000
+NUM_SKUS = 50
+NUM_DISCOUNTS = 10
+BAD_ROW_RATE = 0.05
+REPEATS = 5
+
+LEGACY_FILTER = (
+    "order_id != '' AND sku_id != '' AND discount_code != '' AND quantity IS NOT NULL "
+    "AND unit_price IS NOT NULL AND quantity != 0 AND unit_price != 0"
+)
+
+
+def build_tables(spark):
+    sku_ids = [f"SKU{i:04}" for i in range(1, NUM_SKUS + 1)]
+    codes = [f"DISC{i:02}" for i in range(1, NUM_DISCOUNTS + 1)]
+    sku_df = spark.createDataFrame([(s, 9.99) for s in sku_ids], ["sku_id", "price"])
+    # Discounts in the shape gluejob.py passes to the order_items step.
+    discounts_df = spark.createDataFrame([(c, 10.0) for c in codes], ["discount_code", "line_discount_amount"])
+
+    # Bad rows are generated in Spark so the driver never holds the whole table.
+    sku_expr = "CASE WHEN rand(1) < {r} THEN '' ELSE concat('SKU', lpad(CAST(id % {n} + 1 AS STRING), 4, '0')) END"
+    order_items_df = spark.range(NUM_ORDER_ITEMS).selectExpr(
+        "CASE WHEN rand(2) < {r} THEN '' ELSE concat('ORD', CAST(id DIV 3 AS STRING)) END AS order_id"
+        .format(r=BAD_ROW_RATE),
+        (sku_expr + " AS sku_id").format(r=BAD_ROW_RATE, n=NUM_SKUS),
+        "CASE WHEN rand(3) < {r} THEN 0 ELSE CAST(id % 4 + 1 AS INT) END AS quantity"
+        .format(r=BAD_ROW_RATE),
+        "CAST(9.99 AS DOUBLE) AS unit_price",
+        "CASE WHEN id % 2 = 0 THEN '' ELSE concat('DISC', lpad(CAST(id % {n} + 1 AS STRING), 2, '0')) END"
+        " AS discount_code".format(n=NUM_DISCOUNTS),
+    ).cache()
+    order_items_df.count()
+    return sku_df, discounts_df, order_items_df
+
+
+def run_legacy(order_items_df, sku_df, discounts_df):
+    order_items_df.filter(LEGACY_FILTER) \
+        .withColumn("quantity", col("quantity").cast("int")) \
+        .withColumn("unit_price", col("unit_price").cast("double")) \
+        .withColumn("item_total", col("quantity") * col("unit_price")) \
+        .join(sku_df, on="sku_id", how="inner") \
+        .join(discounts_df.select("discount_code", "line_discount_amount"), on="discount_code", how="inner") \
+        .write.format("noop").mode("overwrite").save()
+
+
+def run_tag_only(order_items_df, sku_df, discounts_df):
+    dimensions = {"sku_master": sku_df, "discounts_applied": discounts_df}
+    tagged = attach_references(order_items_df, "order_items", dimensions)
+    tagged = tag_failures(tagged, TABLE_RULES["order_items"])
+    tagged.drop(*["_ref_" + dim for _, dim in TABLE_REFERENCES["order_items"]]) \
+        .write.format("noop").mode("overwrite").save()
+
+
+def run_rules(order_items_df, sku_df, discounts_df):
+    valid_df, quarantine_df, _, tagged_df = validate(order_items_df, "order_items", {
+        "sku_master": sku_df,
+        "discounts_applied": discounts_df,
+    })
+    enrich_order_items(valid_df, sku_df, discounts_df) \
+        .write.format("noop").mode("overwrite").save()
+    quarantine_df.write.format("noop").mode("overwrite").save()
+    tagged_df.unpersist(blocking=True)
+
+
+VARIANTS = [
+    ("legacy filters + inner joins", run_legacy),
+    ("tag only (reference joins + rule tagging)", run_tag_only),
+    ("rules (tag + rule counts + enrichment + quarantine)", run_rules),
+]
+
+
+def time_interleaved(*dfs):
+    for _, fn in VARIANTS:
+        fn(*dfs)  # untimed warm-up
+    timings = {label: [] for label, _ in VARIANTS}
+    for _ in range(REPEATS):
+        for label, fn in VARIANTS:
+            start = time.perf_counter()
+            fn(*dfs)
+            timings[label].append(time.perf_counter() - start)
+    return timings
+
+
+def report(label, timings, baseline):
+    runs = ", ".join(f"{t:.2f}s" for t in timings)
+    median = statistics.median(timings)
+    print(f"{label}: {runs} (median {median:.2f}s, {median / baseline:.2f}x legacy)")
+
+
+def main():
+    spark = SparkSession.builder.master("local[*]").appName("dq-benchmark").getOrCreate()
+    spark.sparkContext.setLogLevel("WARN")
+    sku_df, discounts_df, order_items_df = build_tables(spark)
+
+    timings = time_interleaved(order_items_df, sku_df, discounts_df)
+    legacy = timings[VARIANTS[0][0]]
+    baseline = statistics.median(legacy)
+
+    print(f"order_items rows: {NUM_ORDER_ITEMS:,}")
+    for label, _ in VARIANTS:
+        report(label, timings[label], baseline)
+    spark.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Check the Glue data-quality rules and order-item enrichment on sample rows.
+
+Runs under a local PySpark session (``pip install pyspark``, Java required):
+
+    python scripts/check_data_quality.py
+
+Covers every table's rule set and the NULL handling in ``data_quality``: a
+NULL predicate fails its rule, an unmatched key leaves a NULL ``_ref_*`` flag,
+and an empty or NULL discount code is valid and reaches the order totals with
+a zero discount.
+"""
+import sys
+from pathlib import Path
+
+from pyspark.sql import SparkSession
+from pyspark.sql.functions import sum as sum_
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "glue"))
+from data_quality import (  # noqa: E402
+    FAILED_RULES_COL, TABLE_RULES, enrich_order_items, rule_counts, validate,
+)
+
+ORDER_ITEMS_SCHEMA = "row_id STRING, order_id STRING, sku_id STRING, quantity INT, unit_price DOUBLE, discount_code STRING"
+
+ORDER_ITEMS = [
+    ("valid_with_code", "ORD1", "SKU0001", 2, 9.99, "DISC01"),
+    ("empty_discount", "ORD1", "SKU0001", 1, 9.99, ""),
+    ("null_discount", "ORD2", "SKU0001", 1, 9.99, None),
+    ("empty_order_id", "", "SKU0001", 1, 9.99, ""),
+    ("null_quantity", "ORD3", "SKU0001", None, 9.99, None),
+    ("unknown_sku", "ORD4", "SKU9999", 1, 9.99, None),
+    ("unknown_discount", "ORD5", "SKU0001", 1, 9.99, "NOPE"),
+    ("empty_sku_bad_code", "ORD6", "", 0, 9.99, "NOPE"),
+]
+
+EXPECTED_FAILURES = {
+    "valid_with_code": [],
+    "empty_discount": [],
+    "null_discount": [],
+    "empty_order_id": ["missing_order_id"],
+    "null_quantity": ["invalid_quantity"],
+    "unknown_sku": ["unknown_sku_id"],
+    "unknown_discount": ["unknown_discount_code"],
+    # An empty SKU is reported as missing, not also as unknown.
+    "empty_sku_bad_code": ["missing_sku_id", "invalid_quantity", "unknown_discount_code"],
+}
+
+EXPECTED_COUNTS = {
+    "rows_total": 8,
+    "rows_rejected": 5,
+    "missing_order_id": 1,
+    "missing_sku_id": 1,
+    "invalid_quantity": 2,
+    "invalid_unit_price": 0,
+    "unknown_sku_id": 1,
+    "unknown_discount_code": 2,
+}
+
+
+# Single-key tables: an empty and a NULL key are both missing.
+KEY_ONLY_TABLES = {
+    "sku_master": ("sku_id", "missing_sku_id"),
+    "discounts_applied": ("discount_code", "missing_discount_code"),
+    "orders": ("order_id", "missing_order_id"),
+}
+
+INVENTORY_LOGS_SCHEMA = "row_id STRING, sku_id STRING, store_id INT, current_stock INT"
+
+INVENTORY_LOGS = [
+    ("valid", "SKU0001", 1, 5),
+    ("unknown_sku", "SKU9999", 1, 5),
+    ("null_store_id", "SKU0001", None, 5),
+    ("zero_stock", "SKU0001", 1, 0),
+    ("empty_sku_null_stock", "", 1, None),
+]
+
+EXPECTED_INVENTORY_FAILURES = {
+    "valid": [],
+    "unknown_sku": ["unknown_sku_id"],
+    "null_store_id": ["missing_store_id"],
+    "zero_stock": ["invalid_current_stock"],
+    "empty_sku_null_stock": ["missing_sku_id", "invalid_current_stock"],
+}
+
+EXPECTED_INVENTORY_COUNTS = {
+    "rows_total": 5,
+    "rows_rejected": 4,
+    "missing_sku_id": 1,
+    "missing_store_id": 1,
+    "invalid_current_stock": 2,
+    "unknown_sku_id": 1,
+}
+
+# Valid order items only: DISC01 is worth 10.0, the code-less items nothing.
+EXPECTED_ORDER_TOTALS = {
+    "ORD1": (29.97, 10.0),
+    "ORD2": (9.99, 0.0),
+}
+
+
+def check_rules(df, table, expected_failures, expected_counts, dimensions=None):
+    """Validate ``df`` and assert its reason codes and rule counts."""
+    valid_df, quarantine_df, metrics, tagged_df = validate(df, table, dimensions)
+
+    failures = {row["row_id"]: row[FAILED_RULES_COL] for row in tagged_df.collect()}
+    assert failures == expected_failures, (table, failures)
+    assert metrics == expected_counts, (table, metrics)
+    assert rule_counts(tagged_df, TABLE_RULES[table]) == expected_counts, table
+
+    valid_ids = {row["row_id"] for row in valid_df.collect()}
+    assert valid_ids == {k for k, v in expected_failures.items() if not v}, (table, valid_ids)
+    assert FAILED_RULES_COL not in valid_df.columns, table
+    assert not any(c.startswith("_ref_") for c in tagged_df.columns), (table, tagged_df.columns)
+    assert quarantine_df.count() == expected_counts["rows_rejected"], table
+    return valid_df, tagged_df
+
+
+def check_key_only_tables(spark):
+    for table, (key, code) in KEY_ONLY_TABLES.items():
+        df = spark.createDataFrame(
+            [("valid", "K1"), ("empty_key", ""), ("null_key", None)],
+            f"row_id STRING, {key} STRING",
+        )
+        _, tagged_df = check_rules(
+            df, table,
+            {"valid": [], "empty_key": [code], "null_key": [code]},
+            {"rows_total": 3, "rows_rejected": 2, code: 2},
+        )
+        tagged_df.unpersist()
+
+
+def check_order_items(spark, sku_df, discounts_df):
+    order_items_df = spark.createDataFrame(ORDER_ITEMS, ORDER_ITEMS_SCHEMA)
+    valid_df, tagged_df = check_rules(
+        order_items_df, "order_items", EXPECTED_FAILURES, EXPECTED_COUNTS,
+        {"sku_master": sku_df, "discounts_applied": discounts_df},
+    )
+
+    # Code-less items must survive the enrichment joins with a zero discount.
+    enriched = {row["row_id"]: row for row in
+                enrich_order_items(valid_df, sku_df, discounts_df).collect()}
+    assert set(enriched) == {"valid_with_code", "empty_discount", "null_discount"}, set(enriched)
+    assert enriched["valid_with_code"]["line_discount_amount"] == 10.0
+    assert enriched["empty_discount"]["line_discount_amount"] == 0.0
+    assert enriched["null_discount"]["line_discount_amount"] == 0.0
+
+    # Same aggregation as the job's order_totals.
+    order_totals = enrich_order_items(valid_df, sku_df, discounts_df).groupBy("order_id").agg(
+        sum_("item_total").alias("order_total"),
+        sum_("line_discount_amount").alias("total_discount_amount"),
+    )
+    totals = {
+        row["order_id"]: (round(row["order_total"], 2), row["total_discount_amount"])
+        for row in order_totals.collect()
+    }
+    assert totals == EXPECTED_ORDER_TOTALS, totals
+    tagged_df.unpersist()
+
+
+def check_inventory_logs(spark, sku_df):
+    inventory_df = spark.createDataFrame(INVENTORY_LOGS, INVENTORY_LOGS_SCHEMA)
+    _, tagged_df = check_rules(
+        inventory_df, "inventory_logs", EXPECTED_INVENTORY_FAILURES,
+        EXPECTED_INVENTORY_COUNTS, {"sku_master": sku_df},
+    )
+    tagged_df.unpersist()
+
+
+def main():
+    spark = SparkSession.builder.master("local[1]").appName("dq-check").getOrCreate()
+    spark.sparkContext.setLogLevel("WARN")
+    # Dimension frames in the shape gluejob.py hands to the later steps.
+    sku_df = spark.createDataFrame([("SKU0001", 9.99)], "sku_id STRING, price DOUBLE")
+    discounts_df = spark.createDataFrame(
+        [("DISC01", 10.0)], "discount_code STRING, line_discount_amount DOUBLE"
+    )
+
+    check_key_only_tables(spark)
+    check_order_items(spark, sku_df, discounts_df)
+    check_inventory_logs(spark, sku_df)
+
+    spark.stop()
+    print("data quality checks passed")
+
+
+if __name__ == "__main__":
+    main()